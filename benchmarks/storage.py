@@ -0,0 +1,178 @@
+import argparse
+import glob
+import json
+import os
+import random
+import statistics
+import subprocess
+import tempfile
+import time
+
+from utils.madlib_manager import MadlibManager
+from utils.remind_manager import ReminderManager
+from utils.url_manager import AllowlistManager
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+WORD_TYPES = ["noun", "verb", "adjective"]
+
+def summarize(samples: list[float]) -> dict:
+    ordered = sorted(samples)
+    pick = lambda pct: ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))] * 1000
+    return {"n": len(ordered), "mean_ms": statistics.fmean(ordered) * 1000, "p50_ms": pick(50),
+            "p95_ms": pick(95), "p99_ms": pick(99), "max_ms": ordered[-1] * 1000}
+
+def measure(func, args_list: list[tuple]) -> dict:
+    samples = []
+    for args in args_list:
+        started = time.perf_counter()
+        func(*args)
+        samples.append(time.perf_counter() - started)
+    return summarize(samples)
+
+def throughput(count: int, elapsed: float) -> dict:
+    return {"n": count, "seconds": elapsed, "per_second": count / elapsed if elapsed else 0.0}
+
+def bench_reminders(total: int, samples: int) -> dict:
+    manager = ReminderManager()
+    now = int(time.time())
+    rows = [(random.randint(10**17, 10**18), random.randint(10**17, 10**18),
+             now + random.randint(60, 365 * 86400), "benchmark reminder") for _ in range(samples)]
+    started = time.perf_counter()
+    for row in rows:
+        manager.add_reminder(*row)
+    add_one = throughput(len(rows), time.perf_counter() - started)
+
+    bulk = [(random.randint(10**17, 10**18), random.randint(10**17, 10**18),
+             now + random.randint(60, 365 * 86400), "benchmark reminder") for _ in range(total - samples)]
+    started = time.perf_counter()
+    manager.cursor.executemany("INSERT INTO reminders (author_id, channel_id, reminder_timestamp, message) "
+                               "VALUES (?, ?, ?, ?)", bulk)
+    manager.conn.commit()
+    bulk_fill = throughput(len(bulk), time.perf_counter() - started)
+
+    # Each poll looks a little further ahead, so some reminders are due as the table is scanned
+    due = measure(manager.get_due_reminders, [(now + i * 60,) for i in range(samples)])
+    ids = [(random.randint(1, total),) for _ in range(samples)]
+    get_one = measure(manager.get_reminder, ids)
+    remove = measure(manager.remove_reminder, ids)
+    manager.close()
+    return {"rows": total, "add_reminder": add_one, "bulk_insert": bulk_fill, "get_due_reminders": due,
+            "get_reminder": get_one, "remove_reminder": remove}
+
+def bench_madlibs(total: int, guilds: int, samples: int) -> dict:
+    manager = MadlibManager()
+    guild_ids = [random.randint(10**17, 10**18) for _ in range(guilds)]
+    words = [(random.choice(guild_ids), random.choice(WORD_TYPES), f"word{i}") for i in range(total)]
+    started = time.perf_counter()
+    for guild_id, word_type, word in words[:samples]:
+        manager.add_word(word_type, word, guild_id)
+    add_one = throughput(samples, time.perf_counter() - started)
+
+    started = time.perf_counter()
+    manager.cursor.executemany("INSERT OR IGNORE INTO words (guild_id, type, value) VALUES (?, ?, ?)",
+                               words[samples:])
+    manager.conn.commit()
+    bulk_fill = throughput(total - samples, time.perf_counter() - started)
+
+    picks = [(random.choice(WORD_TYPES), random.choice(guild_ids)) for _ in range(samples)]
+    guild_pick = measure(manager._get_random_guild_word, picks)
+    random_word = measure(manager.get_random_word, picks)
+    manager.close()
+    return {"words": total, "guilds": guilds, "add_word": add_one, "bulk_insert": bulk_fill,
+            "random_guild_word": guild_pick, "get_random_word": random_word}
+
+def bench_allowlist(total: int, samples: int) -> dict:
+    manager = AllowlistManager()
+    allowlist = {f"domain{i}.{random.choice(['com', 'net', 'org', 'co.uk'])}":
+                 random.sample(["id", "v", "t", "q", "page", "list", "index", "lang", "ref", "s"], k=3)
+                 for i in range(total)}
+    started = time.perf_counter()
+    domains, params = manager.import_allowlist(allowlist)
+    bulk_import = throughput(params, time.perf_counter() - started)
+
+    known = list(allowlist)
+    hosts = [(random.choice(["", "www.", "m.", "a.b."]) + random.choice(known),) for _ in range(samples)]
+    hosts += [(f"unknown{i}.example.com",) for i in range(samples // 4)]
+    random.shuffle(hosts)
+    lookup = measure(manager._lookup_params, hosts)
+    manager.get_params(hosts[0][0])
+    cached = measure(manager.get_params, [hosts[0]] * samples)
+    started = time.perf_counter()
+    exported = manager.export_allowlist()
+    export = throughput(len(exported), time.perf_counter() - started)
+    manager.close()
+    return {"domains": domains, "params": params, "import_allowlist": bulk_import, "suffix_lookup": lookup,
+            "cached_lookup": cached, "export_allowlist": export}
+
+def git_revision() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def flatten(results: dict, prefix: str = "") -> dict:
+    flat = {}
+    for key, value in results.items():
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{prefix}{key}."))
+        elif key in ("p50_ms", "p95_ms", "per_second"):
+            flat[f"{prefix}{key}"] = value
+    return flat
+
+def compare(current: dict, previous_path: str):
+    with open(previous_path, encoding="utf-8") as f:
+        previous = json.load(f)
+    before, after = flatten(previous["results"]), flatten(current["results"])
+    print(f"\nCompared with {os.path.basename(previous_path)} (revision {previous.get('revision')}):")
+    for key, value in after.items():
+        old = before.get(key)
+        if not old:
+            continue
+        change = (value - old) / old * 100
+        better = change > 0 if key.endswith("per_second") else change < 0
+        print(f"  {key:<45}{old:>12.3f} -> {value:>12.3f}  {change:+7.1f}% {'better' if better else 'worse'}")
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.storage",
+                                     description="Benchmark the SQLite managers on large datasets.")
+    parser.add_argument("--reminders", type=int, default=1_000_000)
+    parser.add_argument("--words", type=int, default=100_000)
+    parser.add_argument("--guilds", type=int, default=5_000)
+    parser.add_argument("--domains", type=int, default=50_000)
+    parser.add_argument("--samples", type=int, default=2_000, help="Timed operations per measurement")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply every dataset size, e.g. 0.01")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--compare", help="Result file to compare against (default: the latest saved run)")
+    parser.add_argument("--no-save", action="store_true", help="Don't write the results file")
+    args = parser.parse_args()
+    random.seed(args.seed)
+
+    scaled = lambda n: max(args.samples, int(n * args.scale))
+    with tempfile.TemporaryDirectory(prefix="noyabot-bench-") as data_dir:
+        ReminderManager.DB_PATH = os.path.join(data_dir, "reminders.db")
+        MadlibManager.DB_PATH = os.path.join(data_dir, "madlibs.db")
+        AllowlistManager.DB_PATH = os.path.join(data_dir, "allowlist.db")
+
+        results = {}
+        print(f"Benchmarking reminders ({scaled(args.reminders)} rows)...")
+        results["reminders"] = bench_reminders(scaled(args.reminders), args.samples)
+        print(f"Benchmarking madlibs ({scaled(args.words)} words across {max(1, int(args.guilds * args.scale))} guilds)...")
+        results["madlibs"] = bench_madlibs(scaled(args.words), max(1, int(args.guilds * args.scale)), args.samples)
+        print(f"Benchmarking allowlist ({scaled(args.domains)} domains)...")
+        results["allowlist"] = bench_allowlist(scaled(args.domains), args.samples)
+    run = {"timestamp": int(time.time()), "revision": git_revision(), "args": vars(args), "results": results}
+    print(json.dumps(results, indent=2))
+
+    previous = args.compare or max(glob.glob(os.path.join(RESULTS_DIR, "storage-*.json")), default=None)
+    if previous:
+        compare(run, previous)
+    if not args.no_save:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        path = os.path.join(RESULTS_DIR, f"storage-{time.strftime('%Y%m%d-%H%M%S')}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(run, f, indent=2)
+        print(f"\nSaved results to {path}")
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,20 @@
+import io
 import json
-import math
 import os
 import re
-from collections import Counter
 from urllib.parse import urlparse, urlunparse, parse_qs, urlencode
 
 import discord
 from discord.ext import commands
 
+from utils import rule_updater
+from utils.url_filter import filter_fallback_all, rules_for
 from utils.url_manager import AllowlistManager
 
 URL_CHANNEL_ID = int(os.getenv("URL_LOG_CHANNEL_ID"))
 
 def load_rules() -> dict:
-    rules_path = "data/rules.json"
+    rules_path = rule_updater.RULES_PATH
     try:
         with open(rules_path, "r") as f:
             data = json.load(f)
@@ -23,16 +24,21 @@ def load_rules() -> dict:
         print(f"WARNING: {rules_path} not found. URL cleaner will have no rules.")
         return {"GENERAL": []}
 
-def calculate_entropy(text: str) -> float:
-    if not text:
-        return 0.0
-    entropy = 0
-    length = len(text)
-    counts = Counter(text)
-    for count in counts.values():
-        p_x = count / length
-        entropy += - p_x * math.log2(p_x)
-    return entropy
+def parse_allowlist(raw: bytes) -> dict[str, list[str]]:
+    try:
+        data = json.loads(raw)
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
+        raise ValueError(f"invalid JSON ({e})")
+    if not isinstance(data, dict):
+        raise ValueError("expected an object mapping domains to parameter lists")
+    allowlist = {}
+    for domain, params in data.items():
+        if isinstance(params, str):
+            params = params.split(",")
+        if not isinstance(params, list) or not all(isinstance(param, str) for param in params):
+            raise ValueError(f"parameters for `{domain}` must be a list of strings")
+        allowlist[domain] = params
+    return allowlist
 
 class FeedbackView(discord.ui.View):
     def __init__(self, cog, url_data: list):
@@ -53,11 +59,27 @@ class FeedbackView(discord.ui.View):
 class CleanerCog(commands.Cog):
     def __init__(self, bot: discord.Bot):
         self.bot = bot
-        self.db_manager = AllowlistManager()
-        self.rules = load_rules()
+        state = bot.handoff.get(self.qualified_name, {})
+        self.db_manager = state.get("db_manager") or AllowlistManager()
+        self.rules = state.get("rules") or load_rules()
+        self._owns_db = True
 
     def cog_unload(self):
-        self.db_manager.close()
+        if self._owns_db:
+            self.db_manager.close()
+
+    def export_state(self) -> dict:
+        # In-flight commands keep using the manager, the reloaded cog closes it later
+        self._owns_db = False
+        return {"db_manager": self.db_manager, "rules": self.rules}
+
+    async def reload_data(self):
+        self.rules = await self.bot.executor.run(load_rules)
+        self.db_manager.cache.clear()
+
+    @commands.Cog.listener()
+    async def on_rules_updated(self):
+        self.rules = await self.bot.executor.run(load_rules)
 
     def _filter_allowlist(self, url: str) -> str | None:
         parsed_url = urlparse(url)
@@ -72,29 +94,6 @@ class CleanerCog(commands.Cog):
         url_parts[4] = new_query
         return urlunparse(url_parts)
 
-    def _filter_fallback(self, url: str):
-        parsed_url = urlparse(url)
-        query_params = parse_qs(parsed_url.query)
-        params_to_remove = {p.lower() for p in self.rules.get("GENERAL", [])}
-        domain_parts = parsed_url.netloc.lower().split('.')
-        for i in range(len(domain_parts)):
-            current_domain = ".".join(domain_parts[i:])
-            if current_domain in self.rules:
-                params_to_remove.update({p.lower() for p in self.rules[current_domain]})
-        filtered_params = { key: value for key, value in query_params.items() if key.lower() not in params_to_remove}
-        final_params = {}
-        for key, value_list in filtered_params.items():
-            value_str = value_list[0]
-            if len(value_str) >= 20:
-                entropy = calculate_entropy(value_str)
-                if entropy >= 4:
-                    continue
-            final_params[key] = value_list
-        new_query = urlencode(final_params, doseq=True)
-        url_parts = list(parsed_url)
-        url_parts[4] = new_query
-        return urlunparse(url_parts)
-
     async def _log_cleaning(self, *, title: str, color: discord.Color, original_url: str, cleaned_url: str,
                             triggered_by: discord.User = None):
         parsed = urlparse(cleaned_url)
@@ -121,11 +120,19 @@ class CleanerCog(commands.Cog):
         if not found_urls:
             await ctx.followup.send("No URLs were found in this message.")
             return
+        allowlisted = {url: self._filter_allowlist(url) for url in found_urls}
+        fallback_urls = [url for url, cleaned_url in allowlisted.items() if cleaned_url is None]
+        if fallback_urls:
+            # Only the matching rules are shipped, in case the work goes to a worker process
+            fallback_cleaned = await self.bot.executor.run(filter_fallback_all, fallback_urls,
+                                                           rules_for(fallback_urls, self.rules), process=True)
+        else:
+            fallback_cleaned = {}
         processed_data = []
         for url in found_urls:
-            cleaned_url = self._filter_allowlist(url)
+            cleaned_url = allowlisted[url]
             if cleaned_url is None:
-                cleaned_url = self._filter_fallback(url)
+                cleaned_url = fallback_cleaned[url]
                 await self._log_cleaning(title="Fallback Filter Used",
                                          color=discord.Color.yellow(), original_url=url, cleaned_url=cleaned_url)
             processed_data.append({"original": url, "cleaned": cleaned_url})
@@ -137,12 +144,37 @@ class CleanerCog(commands.Cog):
     @commands.slash_command(name="urledit", description="Manage the URL allowlist.",
                             default_permissions=discord.Permissions(administrator=True),
                             guild_ids=[911994369605775431])
-    @discord.option("action", description="The action to perform.", choices=["view", "append", "remove"])
-    @discord.option("domain", description="The domain to manage")
+    @discord.option("action", description="The action to perform.",
+                    choices=["view", "append", "remove", "import", "export"])
+    @discord.option("domain", description="The domain to manage", default=None)
     @discord.option("param", description="The parameter to add/remove", default=None)
-    async def urledit(self, ctx, action: str, domain: str, param: str = None):
+    @discord.option("file", description="JSON allowlist to import, e.g. {\"youtube.com\": [\"v\", \"t\"]}",
+                    type=discord.Attachment, default=None)
+    @discord.option("replace", description="Replace the whole allowlist on import instead of merging", default=False)
+    async def urledit(self, ctx, action: str, domain: str = None, param: str = None,
+                      file: discord.Attachment = None, replace: bool = False):
         if not await self.bot.is_owner(ctx.author):
             return await ctx.respond("You do not have permission to use this command.", ephemeral=True)
+
+        if action == "export":
+            allowlist = self.db_manager.export_allowlist()
+            data = io.BytesIO(json.dumps(allowlist, indent=2).encode())
+            return await ctx.respond(f"Exported {len(allowlist)} domains.",
+                                     file=discord.File(data, filename="allowlist.json"), ephemeral=True)
+
+        if action == "import":
+            if file is None:
+                return await ctx.respond("The `file` option is required for the `import` action.", ephemeral=True)
+            try:
+                allowlist = parse_allowlist(await file.read())
+                domains, added = self.db_manager.import_allowlist(allowlist, replace=replace)
+            except ValueError as e:
+                return await ctx.respond(f"Couldn't read `{file.filename}`: {e}", ephemeral=True)
+            verb = "Replaced the allowlist with" if replace else "Imported"
+            return await ctx.respond(f"{verb} {domains} domains ({added} new parameters).", ephemeral=True)
+
+        if not domain:
+            return await ctx.respond(f"The `domain` option is required for the `{action}` action.", ephemeral=True)
         domain = domain.lower()
         param = param.lower() if param else None
 
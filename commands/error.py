@@ -1,14 +1,92 @@
 import os
 import traceback
+from collections import Counter
 
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 
 LOG_CHANNEL_ID = int(os.getenv("ERROR_LOG_CHANNEL_ID"))
+BATCH_SECONDS = 30
+
+PROJECT_DIRS = tuple(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), name) + os.sep
+                     for name in ("commands", "utils"))
+
+def fingerprint(error: BaseException) -> tuple[str, str, int]:
+    frames = traceback.extract_tb(error.__traceback__)
+    if not frames:
+        return type(error).__name__, "unknown", 0
+    own_frames = [frame for frame in frames if os.path.abspath(frame.filename).startswith(PROJECT_DIRS)]
+    frame = own_frames[-1] if own_frames else frames[-1]
+    return type(error).__name__, frame.filename, frame.lineno
 
 class ErrorHandlerCog(commands.Cog):
     def __init__(self, bot: discord.Bot):
         self.bot = bot
+        self.pending = bot.handoff.get(self.qualified_name, {}).get("pending", {})
+        self.flush_errors.start()
+
+    def cog_unload(self):
+        self.flush_errors.cancel()
+
+    def export_state(self) -> dict:
+        state = {"pending": self.pending}
+        self.pending = {}
+        return state
+
+    def _record(self, ctx: discord.ApplicationContext, error: BaseException, embed: discord.Embed, traceback_text: str):
+        key = fingerprint(error)
+        group = self.pending.get(key)
+        if group is None:
+            group = self.pending[key] = {"embed": embed, "traceback": traceback_text, "count": 0,
+                                         "commands": Counter(), "guilds": Counter()}
+        group["count"] += 1
+        group["commands"][f"/{ctx.command.name}"] += 1
+        group["guilds"][f"{ctx.guild.name} (`{ctx.guild.id}`)" if ctx.guild else "Direct Message"] += 1
+
+    @staticmethod
+    def _summary_embed(key: tuple[str, str, int], group: dict) -> discord.Embed:
+        error_type, filename, lineno = key
+        embed = discord.Embed(
+            title="Repeated Command Error",
+            description=f"`{error_type}` at `{os.path.basename(filename)}:{lineno}` occurred "
+                        f"**{group['count']}** times in the last {BATCH_SECONDS} seconds.",
+            color=discord.Color.red()
+        )
+        commands_text = "\n".join(f"`{name}` x{count}" for name, count in group["commands"].most_common(10))
+        guilds_text = "\n".join(f"{name} x{count}" for name, count in group["guilds"].most_common(10))
+        if len(group["guilds"]) > 10:
+            guilds_text += f"\n...and {len(group['guilds']) - 10} more"
+        embed.add_field(name="Commands", value=commands_text[:1024], inline=False)
+        embed.add_field(name="Affected Servers", value=guilds_text[:1024], inline=False)
+        embed.add_field(name="Traceback", value=f"```py\n{group['traceback'][-1000:]}\n```", inline=False)
+        return embed
+
+    async def _flush(self):
+        if not self.pending:
+            return
+        pending, self.pending = self.pending, {}
+        log_channel = self.bot.get_channel(LOG_CHANNEL_ID)
+        if not log_channel:
+            print(f"Error: Log channel with ID {LOG_CHANNEL_ID} not found, dropping {len(pending)} error report(s).")
+            return
+        for key, group in pending.items():
+            embed = group["embed"] if group["count"] == 1 else self._summary_embed(key, group)
+            try:
+                await log_channel.send(embed=embed)
+            except discord.HTTPException as e:
+                print(f"Failed to send error report for {key[0]}: {e}")
+
+    @tasks.loop(seconds=BATCH_SECONDS)
+    async def flush_errors(self):
+        await self._flush()
+
+    @flush_errors.before_loop
+    async def before_flush_errors(self):
+        await self.bot.wait_until_ready()
+
+    @flush_errors.after_loop
+    async def after_flush_errors(self):
+        await self._flush()
 
     @commands.Cog.listener()
     async def on_application_command_error(self, ctx: discord.ApplicationContext, error: discord.DiscordException):
@@ -47,11 +125,7 @@ class ErrorHandlerCog(commands.Cog):
                 embed.add_field(name="Location", value="Direct Message", inline=False)
             truncated_traceback = traceback_text[-1000:]
             embed.add_field(name="Traceback", value=f"```py\n{truncated_traceback}\n```", inline=False)
-            log_channel = self.bot.get_channel(LOG_CHANNEL_ID)
-            if log_channel:
-                await log_channel.send(embed=embed)
-            else:
-                print(f"Error: Log channel with ID {LOG_CHANNEL_ID} not found.")
+            self._record(ctx, error, embed, traceback_text)
             await send_error_message("I messed up :( I let Cic7e know")
 
 def setup(bot: discord.Bot):
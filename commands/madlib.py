@@ -12,16 +12,30 @@ class MadCog(commands.Cog):
 
     def __init__(self, bot: discord.Bot):
         self.bot = bot
-        self.db_manager = MadlibManager()
+        self.db_manager = bot.handoff.get(self.qualified_name, {}).get("db_manager") or MadlibManager()
+        self._owns_db = True
 
     def cog_unload(self):
-        self.db_manager.close()
+        if self._owns_db:
+            self.db_manager.close()
+
+    def export_state(self) -> dict:
+        # In-flight commands keep using the manager, the reloaded cog closes it later
+        self._owns_db = False
+        return {"db_manager": self.db_manager}
+
+    async def reload_data(self):
+        await self.bot.executor.run(self.db_manager.reload_static_words)
 
     @commands.slash_command(name="madlib", description="Generate a madlib")
     @commands.cooldown(3, 5, commands.BucketType.member)
     @discord.option("text", description="Your madlib, e.g. '{user}'s [adj] {noun} will [verb]'")
     async def madlib(self, ctx, text: str):
         guild_id = ctx.guild.id if ctx.guild else None
+        if ctx.guild and re.search(r"\{user}|\[user]", text, flags=re.IGNORECASE):
+            if not self.bot.member_cache.is_ready(ctx.guild):
+                await ctx.defer()
+            await self.bot.member_cache.ensure(ctx.guild)
         placeholder_configs = {
             "noun": {"pattern": r"\{noun}|\[noun]", "db_type": "noun"},
             "verb": {"pattern": r"\{verb}|\[verb]", "db_type": "verb"},
@@ -34,8 +48,7 @@ class MadCog(commands.Cog):
             def replacement(_: re.Match, db_type=db_type):
                 if db_type is None:
                     if ctx.guild:
-                        member_list = [g.display_name for g in ctx.guild.members]
-                        user = random.choice(member_list)
+                        user = random.choice(ctx.guild.members).display_name
                     else:
                         user = ctx.author.display_name
                     word = user
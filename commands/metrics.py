@@ -0,0 +1,69 @@
+import asyncio
+import os
+import time
+
+import discord
+from discord.ext import commands, tasks
+
+from utils.metrics import COMMAND_LATENCY, LOOP_LAG, start_server
+
+METRICS_PORT = os.getenv("METRICS_PORT")
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+LAG_INTERVAL = 0.5
+
+class MetricsCog(commands.Cog):
+    def __init__(self, bot: discord.Bot):
+        self.bot = bot
+        state = bot.handoff.get(self.qualified_name)
+        if state:
+            self.started, self.server, self.server_task = state["started"], state["server"], state["server_task"]
+        else:
+            self.started: dict[int, float] = {}
+            self.server = None
+            self.server_task = asyncio.create_task(self._serve()) if METRICS_PORT else None
+        self.monitor_loop_lag.start()
+
+    def export_state(self) -> dict:
+        state = {"started": self.started, "server": self.server, "server_task": self.server_task}
+        self.server = self.server_task = None
+        return state
+
+    def cog_unload(self):
+        self.monitor_loop_lag.cancel()
+        if self.server_task:
+            self.server_task.cancel()
+        if self.server:
+            self.server.close()
+
+    async def _serve(self):
+        try:
+            self.server = await start_server(int(METRICS_PORT), METRICS_HOST)
+            print(f"Serving metrics on http://{METRICS_HOST}:{METRICS_PORT}/metrics")
+        except (OSError, ValueError) as e:
+            print(f"Failed to start metrics server: {e}")
+
+    def _finish(self, ctx: discord.ApplicationContext, status: str):
+        started = self.started.pop(ctx.interaction.id, None)
+        if started is not None:
+            COMMAND_LATENCY.observe(time.perf_counter() - started, command=ctx.command.qualified_name, status=status)
+
+    @commands.Cog.listener()
+    async def on_application_command(self, ctx: discord.ApplicationContext):
+        self.started[ctx.interaction.id] = time.perf_counter()
+
+    @commands.Cog.listener()
+    async def on_application_command_completion(self, ctx: discord.ApplicationContext):
+        self._finish(ctx, "ok")
+
+    @commands.Cog.listener()
+    async def on_application_command_error(self, ctx: discord.ApplicationContext, error: discord.DiscordException):
+        self._finish(ctx, "error")
+
+    @tasks.loop(seconds=0)
+    async def monitor_loop_lag(self):
+        started = time.perf_counter()
+        await asyncio.sleep(LAG_INTERVAL)
+        LOOP_LAG.observe(max(0.0, time.perf_counter() - started - LAG_INTERVAL))
+
+def setup(bot: discord.Bot):
+    bot.add_cog(MetricsCog(bot))
\ No newline at end of file
@@ -0,0 +1,93 @@
+import asyncio
+import cProfile
+import io
+import pstats
+import tracemalloc
+from datetime import datetime, timezone
+
+import discord
+from discord.ext import commands
+
+# Snapshot diffs over long windows can take minutes to sort, far past the executor's default
+REPORT_TIMEOUT = 300
+
+class ProfilerCog(commands.Cog):
+    def __init__(self, bot: discord.Bot):
+        self.bot = bot
+        self.running = False
+
+    @staticmethod
+    def _cpu_report(profiler: cProfile.Profile, seconds: int, top: int) -> str:
+        out = io.StringIO()
+        out.write(f"CPU profile of the event-loop thread over {seconds}s\n\n")
+        stats = pstats.Stats(profiler, stream=out)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(top)
+        stats.sort_stats(pstats.SortKey.TIME).print_stats(top)
+        return out.getvalue()
+
+    @staticmethod
+    def _memory_report(before: tracemalloc.Snapshot, after: tracemalloc.Snapshot, traced: tuple[int, int],
+                       seconds: int, top: int) -> str:
+        current, peak = traced
+        lines = [f"Allocations over {seconds}s (traced now {current / 1048576:.1f} MB, peak {peak / 1048576:.1f} MB)",
+                 "", f"Top {top} growth by line:"]
+        lines += [str(stat) for stat in after.compare_to(before, "lineno")[:top]]
+        lines += ["", f"Top {top} live allocation sites:"]
+        lines += [str(stat) for stat in after.statistics("lineno")[:top]]
+        return "\n".join(lines)
+
+    @commands.slash_command(name="profile", description="Profile the running bot for a few seconds.",
+                            default_permissions=discord.Permissions(administrator=True),
+                            guild_ids=[911994369605775431])
+    @discord.option("mode", description="What to profile", choices=["cpu", "memory", "both"], default="cpu")
+    @discord.option("seconds", description="How long to profile for", min_value=1, max_value=300, default=15)
+    @discord.option("top", description="How many entries to report", min_value=5, max_value=200, default=40)
+    async def profile(self, ctx, mode: str, seconds: int, top: int):
+        if not await self.bot.is_owner(ctx.author):
+            return await ctx.respond("You do not have permission to use this command.", ephemeral=True)
+        if self.running:
+            return await ctx.respond("A profile is already running.", ephemeral=True)
+        self.running = True
+        await ctx.defer(ephemeral=True)
+        profiler = cProfile.Profile() if mode in ("cpu", "both") else None
+        trace_memory = mode in ("memory", "both")
+        started_tracing = False
+        try:
+            if trace_memory and not tracemalloc.is_tracing():
+                tracemalloc.start(10)
+                started_tracing = True
+            before = tracemalloc.take_snapshot() if trace_memory else None
+            if profiler:
+                profiler.enable()
+            try:
+                await asyncio.sleep(seconds)
+            finally:
+                if profiler:
+                    profiler.disable()
+            after = tracemalloc.take_snapshot() if trace_memory else None
+            traced = tracemalloc.get_traced_memory()
+        except ValueError as e:
+            return await ctx.followup.send(f"Couldn't start profiling: `{e}`", ephemeral=True)
+        finally:
+            if started_tracing:
+                tracemalloc.stop()
+            self.running = False
+
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S")
+        files = []
+        try:
+            if profiler:
+                report = await self.bot.executor.run(self._cpu_report, profiler, seconds, top, timeout=REPORT_TIMEOUT)
+                files.append(discord.File(io.BytesIO(report.encode()), filename=f"cpu-{stamp}.txt"))
+            if trace_memory:
+                report = await self.bot.executor.run(self._memory_report, before, after, traced, seconds, top,
+                                                     timeout=REPORT_TIMEOUT)
+                files.append(discord.File(io.BytesIO(report.encode()), filename=f"memory-{stamp}.txt"))
+        except TimeoutError:
+            return await ctx.followup.send(f"Profiled `{mode}` for {seconds}s, but building the report took longer "
+                                           f"than {REPORT_TIMEOUT}s. Try a lower `top` or a shorter window.",
+                                           files=files, ephemeral=True)
+        await ctx.followup.send(f"Profiled `{mode}` for {seconds}s.", files=files, ephemeral=True)
+
+def setup(bot: discord.Bot):
+    bot.add_cog(ProfilerCog(bot))
\ No newline at end of file
@@ -0,0 +1,68 @@
+import time
+
+import discord
+from discord.ext import commands
+
+def extension_names(ctx: discord.AutocompleteContext) -> list[str]:
+    return [name for name in ctx.bot.extensions if ctx.value.lower() in name.lower()][:25]
+
+class ReloadCog(commands.Cog):
+    def __init__(self, bot: discord.Bot):
+        self.bot = bot
+
+    def _cogs_for(self, extension: str | None) -> list[commands.Cog]:
+        return [cog for cog in self.bot.cogs.values() if extension is None or cog.__module__ == extension]
+
+    async def _reload_code(self, extension: str) -> str:
+        cogs = self._cogs_for(extension)
+        try:
+            for cog in cogs:
+                if hasattr(cog, "export_state"):
+                    self.bot.handoff[cog.qualified_name] = await discord.utils.maybe_coroutine(cog.export_state)
+            self.bot.reload_extension(extension)
+        finally:
+            carried = [name for name in (cog.qualified_name for cog in cogs) if self.bot.handoff.pop(name, None)]
+        # Reloaded commands are new objects, so re-link them to their registered ids
+        await self.bot.sync_commands()
+        if carried:
+            return f"carried over state for {', '.join(carried)}"
+        return "no state to carry over"
+
+    async def _reload_data(self, extension: str | None) -> str:
+        reloaded = []
+        for cog in self._cogs_for(extension):
+            if hasattr(cog, "reload_data"):
+                await cog.reload_data()
+                reloaded.append(cog.qualified_name)
+        if not reloaded:
+            return "nothing to reload"
+        return f"refreshed data for {', '.join(reloaded)}"
+
+    @commands.slash_command(name="reload", description="Reload an extension or its data without restarting.",
+                            default_permissions=discord.Permissions(administrator=True),
+                            guild_ids=[911994369605775431])
+    @discord.option("mode", description="Reload the code or only the data", choices=["code", "data"])
+    @discord.option("extension", description="Extension to reload, e.g. commands.cleanurl",
+                    autocomplete=extension_names, default=None)
+    async def reload(self, ctx, mode: str, extension: str = None):
+        if not await self.bot.is_owner(ctx.author):
+            return await ctx.respond("You do not have permission to use this command.", ephemeral=True)
+        if extension and extension not in self.bot.extensions:
+            return await ctx.respond(f"Extension `{extension}` is not loaded.", ephemeral=True)
+        if mode == "code" and not extension:
+            return await ctx.respond("The `extension` option is required to reload code.", ephemeral=True)
+        await ctx.defer(ephemeral=True)
+        started = time.perf_counter()
+        try:
+            if mode == "code":
+                summary = await self._reload_code(extension)
+            else:
+                summary = await self._reload_data(extension)
+        except Exception as e:
+            return await ctx.respond(f"Reload failed, the previous version is still running: `{e}`", ephemeral=True)
+        elapsed = (time.perf_counter() - started) * 1000
+        target = f"`{extension}`" if extension else "all extensions"
+        await ctx.respond(f"Reloaded {mode} for {target} in {elapsed:.0f} ms, {summary}.", ephemeral=True)
+
+def setup(bot: discord.Bot):
+    bot.add_cog(ReloadCog(bot))
\ No newline at end of file
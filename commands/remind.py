@@ -1,12 +1,18 @@
-import dateparser
+import asyncio
+import time
 from datetime import datetime, timezone
 
 import discord
 from discord.ext import commands, tasks
 
+from utils.metrics import REMINDER_LATENESS
 from utils.remind_manager import ReminderManager
+from utils.startup import phase
+
+HANDOFF_TIMEOUT = 10
 
 def get_time(time: str, *, now: datetime | None = None) -> int:
+    import dateparser  # heavy import, deferred until first use or the post-ready warmup
     reference = now or datetime.now(timezone.utc)
     normalized = (time or "").strip() or "in 5 minutes"
     settings = {
@@ -44,12 +50,44 @@ class CancelView(discord.ui.View):
 class ReminderCog(commands.Cog):
     def __init__(self, bot: discord.Bot):
         self.bot = bot
-        self.db_manager = ReminderManager()
+        state = bot.handoff.get(self.qualified_name, {})
+        self.db_manager = state.get("db_manager") or ReminderManager()
+        self.warmed_up = state.get("warmed_up", False)
+        self._owns_db = True
+        self.resume_task = None
         self.check_reminders.start()
 
     def cog_unload(self):
+        if self.resume_task:
+            self.resume_task.cancel()
         self.check_reminders.cancel()
-        self.db_manager.close()
+        if self._owns_db:
+            self.db_manager.close()
+
+    async def export_state(self) -> dict:
+        # Let an in-flight iteration finish, or cog_unload would cancel it mid-send and the reminder would fire twice
+        if self.resume_task:
+            self.resume_task.cancel()
+            self.resume_task = None
+        if self.bot.is_ready():
+            self.check_reminders.stop()
+            try:
+                await asyncio.wait_for(self._loop_stopped(), HANDOFF_TIMEOUT)
+            except TimeoutError:
+                # This cog stays in charge, so bring the loop back once the stuck iteration is done
+                self.resume_task = asyncio.create_task(self._resume_loop())
+                raise RuntimeError(f"a reminder iteration is still running after {HANDOFF_TIMEOUT}s, try again later")
+        self._owns_db = False
+        return {"db_manager": self.db_manager, "warmed_up": self.warmed_up}
+
+    async def _loop_stopped(self):
+        while self.check_reminders.is_running():
+            await asyncio.sleep(0.1)
+
+    async def _resume_loop(self):
+        await self._loop_stopped()
+        self.resume_task = None
+        self.check_reminders.start()
 
     @tasks.loop(seconds=1.0)
     async def check_reminders(self):
@@ -69,6 +107,7 @@ class ReminderCog(commands.Cog):
                     await channel.send(content=f"Hey {user.mention}! {message_content}")
                 else:
                     await user.send(content=f"Hey! {message_content}")
+                REMINDER_LATENESS.observe(max(0.0, time.time() - reminder['reminder_timestamp']))
             except Exception as e:
                 print(f"Failed to send reminder {reminder['id']}: {e}")
             finally:
@@ -78,6 +117,14 @@ class ReminderCog(commands.Cog):
     async def before_check_reminders(self):
         await self.bot.wait_until_ready()
 
+    @commands.Cog.listener()
+    async def on_ready(self):
+        if self.warmed_up:
+            return
+        self.warmed_up = True
+        with phase("dateparser warmup"):
+            await self.bot.executor.run(get_time, "in 5 minutes", timeout=60)
+
     @commands.slash_command(name="remind", description="Sets a persistent reminder, default is 5 minutes")
     @commands.bot_has_permissions(send_messages=True)
     @discord.option("time", description="When do you want to be reminded? Many formats accepted")
@@ -85,9 +132,11 @@ class ReminderCog(commands.Cog):
     async def remind(self, ctx, time: str, message: str):
         now_utc = datetime.now(timezone.utc)
         try:
-            timestamp = get_time(time, now=now_utc)
+            timestamp = await self.bot.executor.run(get_time, time, now=now_utc)
         except ValueError as exc:
             return await ctx.respond(str(exc), ephemeral=True)
+        except TimeoutError:
+            return await ctx.respond("That took too long to understand, try a simpler time.", ephemeral=True)
         seconds_until = timestamp - int(now_utc.timestamp())
         if seconds_until > 315576000:  # 10 years
             return await ctx.respond("You can't set reminders for more than 10 years!", ephemeral=True)
@@ -1,4 +1,5 @@
 import ast
+import math
 import operator as op
 import random
 import re
@@ -6,8 +7,16 @@ import re
 import discord
 from discord.ext import commands
 
+MAX_RESULT_BITS = 10_000
+
+def _checked_pow(base, exponent):
+    # Refuse powers whose result would be huge before computing them, the worker can't be interrupted
+    if abs(base) > 1 and abs(exponent) * math.log2(abs(base)) > MAX_RESULT_BITS:
+        raise ValueError("Result is too large")
+    return op.pow(base, exponent)
+
 ALLOWED_OPERATORS = {ast.Add: op.add, ast.Sub: op.sub, ast.Mult: op.mul, ast.Div: op.truediv,
-                     ast.Pow: op.pow, ast.USub: op.neg}
+                     ast.Pow: _checked_pow, ast.USub: op.neg}
 ALLOWED_NODES = [ast.Expression, ast.BinOp, ast.UnaryOp, ast.Constant, *ALLOWED_OPERATORS.keys()]
 VALID_MATH_PATTERN = re.compile(r'^[0-9+\-*/^()\s]+$')
 
@@ -69,6 +78,14 @@ class RollCog(commands.Cog):
         full_breakdown = "".join(result_parts) + operators[-1]
         return sanitized_for_calc, full_breakdown
 
+    def _evaluate(self, user_input: str, sort: bool):
+        sanitized_string, breakdown_string = self._parse_and_roll(user_input, sort)
+        if not VALID_MATH_PATTERN.fullmatch(sanitized_string):
+            invalid_chars = "".join(sorted(list(set(re.sub(VALID_MATH_PATTERN, "", sanitized_string)))))
+            raise ValueError(f"Unsupported characters: {invalid_chars}")
+        sanitized_string = re.sub(r'(?<=\d|\))\(', '*(', sanitized_string)
+        return self._safe_eval(sanitized_string), breakdown_string
+
     def _safe_eval(self, expression: str):
         expression = str(expression).replace('^', '**')
         if not expression or not expression.strip():
@@ -109,12 +126,7 @@ class RollCog(commands.Cog):
             await ctx.followup.send("I'm....not rolling this", ephemeral=True)
             return
         try:
-            sanitized_string, breakdown_string = self._parse_and_roll(user_input, sort)
-            if not VALID_MATH_PATTERN.fullmatch(sanitized_string):
-                invalid_chars = "".join(sorted(list(set(re.sub(VALID_MATH_PATTERN, "", sanitized_string)))))
-                raise ValueError(f"Unsupported characters: {invalid_chars}")
-            sanitized_string = re.sub(r'(?<=\d|\))\(', '*(', sanitized_string)
-            total = self._safe_eval(sanitized_string)
+            total, breakdown_string = await self.bot.executor.run(self._evaluate, user_input, sort)
             msg_start = f"{ctx.author.mention} rolled `{dice}`"
             if breakdown_string != str(total):
                 formatted_breakdown = re.sub(r'([+*/^]|-(?!>))', r' \1 ', breakdown_string)
@@ -125,13 +137,16 @@ class RollCog(commands.Cog):
                     final_response = f"{msg_start}: `{formatted_breakdown}` = **{total}!**"
             else:
                 final_response = f"{msg_start} = **{total}!**"
-        except (ValueError, TypeError, SyntaxError, KeyError, ZeroDivisionError) as e:
+        except (ValueError, TypeError, SyntaxError, KeyError, ZeroDivisionError, OverflowError) as e:
             if re.search(r'[dD].*\(.*[dD].*\(', user_input):
                  await ctx.followup.send("My abacus just filed a restraining order. "
                                          "Try something like 2d(5+1d5) instead")
                  return
             await ctx.followup.send(f"Sorry, there was an error with your roll: `{e}`")
             return
+        except TimeoutError:
+            await ctx.followup.send("I'm....not rolling this", ephemeral=True)
+            return
         await ctx.followup.send(final_response, allowed_mentions=discord.AllowedMentions.none())
 
 def setup(bot: discord.Bot):
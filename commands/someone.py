@@ -4,11 +4,62 @@ from typing import Union
 import discord
 from discord.ext import commands
 
+from utils.member_index import MemberIndex
+
 
 class SomeoneCog(commands.Cog):
 
     def __init__(self, bot: discord.Bot):
         self.bot = bot
+        self.index = bot.handoff.get(self.qualified_name, {}).get("index") or MemberIndex()
+
+    def export_state(self) -> dict:
+        return {"index": self.index}
+
+    @commands.Cog.listener()
+    async def on_member_join(self, member: discord.Member):
+        self.index.add_member(member)
+
+    @commands.Cog.listener()
+    async def on_raw_member_remove(self, payload: discord.RawMemberRemoveEvent):
+        self.index.remove_member(payload.guild_id, payload.user.id)
+
+    @commands.Cog.listener()
+    async def on_member_update(self, before: discord.Member, after: discord.Member):
+        if before.roles != after.roles:
+            self.index.add_member(after)
+
+    @commands.Cog.listener()
+    async def on_voice_state_update(self, member: discord.Member, before: discord.VoiceState,
+                                    after: discord.VoiceState):
+        if before.channel != after.channel:
+            self.index.update_voice(member, after.channel)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_update(self, before: discord.abc.GuildChannel, after: discord.abc.GuildChannel):
+        if before.overwrites != after.overwrites:
+            self.index.invalidate_channel(after.guild.id, after.id)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel: discord.abc.GuildChannel):
+        self.index.invalidate_channel(channel.guild.id, channel.id)
+
+    @commands.Cog.listener()
+    async def on_guild_role_update(self, before: discord.Role, after: discord.Role):
+        if before.permissions != after.permissions:
+            self.index.invalidate_views(after.guild.id)
+
+    @commands.Cog.listener()
+    async def on_guild_role_delete(self, role: discord.Role):
+        self.index.drop(role.guild.id)
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild):
+        self.index.drop(guild.id)
+
+    @commands.Cog.listener()
+    async def on_member_cache_evict(self, guild: discord.Guild):
+        self.index.drop(guild.id)
 
     @commands.slash_command(name="someone", description="Selects a random user from the server with optional filters.")
     @discord.option("channel", description="Filter users by text or voice channel.",
@@ -17,18 +68,20 @@ class SomeoneCog(commands.Cog):
     @discord.option("ping", description="Ping the selected user?", type=bool, default=False)
     @discord.option("text", description="Additional funny text?", type=str, default="")
     async def someone(self, ctx, channel, role, ping, text):
-        member_pool = [member for member in ctx.guild.members if not member.bot]
-        if role:
-            member_pool = [member for member in member_pool if role in member.roles]
-        if channel:
-            if isinstance(channel, discord.VoiceChannel):
-                member_pool = [member for member in member_pool if member.voice and member.voice.channel == channel]
-            elif isinstance(channel, discord.TextChannel):
-                member_pool = [member for member in member_pool if channel.permissions_for(member).view_channel]
-        if not member_pool:
+        if not self.bot.member_cache.is_ready(ctx.guild):
+            await ctx.defer()
+        await self.bot.member_cache.ensure(ctx.guild)
+        member_pool = self.index.pool(ctx.guild, role=role, channel=channel)
+        chosen_member = None
+        while member_pool and chosen_member is None:
+            member_id = random.choice(tuple(member_pool))
+            chosen_member = ctx.guild.get_member(member_id)
+            if chosen_member is None:
+                member_pool.discard(member_id)
+                self.index.remove_member(ctx.guild.id, member_id)
+        if chosen_member is None:
             await ctx.respond("No users found!", ephemeral=True)
             return
-        chosen_member = random.choice(member_pool)
         if ping:
             mentions = discord.AllowedMentions.users
         else:
@@ -0,0 +1,203 @@
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import random
+import shutil
+import tempfile
+import time
+from collections import Counter
+
+URL_LOG_CHANNEL_ID = 1
+ERROR_LOG_CHANNEL_ID = 2
+os.environ.setdefault("URL_LOG_CHANNEL_ID", str(URL_LOG_CHANNEL_ID))
+os.environ.setdefault("ERROR_LOG_CHANNEL_ID", str(ERROR_LOG_CHANNEL_ID))
+
+from loadtest.fakes import FakeApplicationContext, FakeGuild, FakeMessage, HarnessBot, RecordingHTTP
+from utils import rule_updater
+from utils.madlib_manager import MadlibManager
+from utils.remind_manager import ReminderManager
+from utils.url_manager import AllowlistManager
+
+SAMPLE_URLS = [
+    "https://www.youtube.com/watch?v=dQw4w9WgXcQ&si=Jk3nX0q9aZ8pLm2R&feature=share",
+    "https://www.amazon.com/dp/B08N5WRWNW?ref_=ast_sto_dp&th=1&psc=1&tag=abcdef-20",
+    "https://example.com/article?utm_source=newsletter&utm_medium=email&id=42",
+    "https://open.spotify.com/track/4uLU6hMCjMI75M1A2tKUQC?si=9f8e7d6c5b4a3a2b1c0d",
+]
+
+def scenarios(guilds: list) -> dict:
+    def pick():
+        guild = random.choice(guilds)
+        author = random.choice(guild.members)
+        return guild, author, random.choice(guild.text_channels)
+
+    def roll():
+        guild, author, channel = pick()
+        return (guild, author, channel), {"dice": random.choice(["1d20", "4d6+2", "2d(5+1d5)", "10d100*2"]),
+                                          "sort": False, "whisper": False}
+
+    def madlib():
+        guild, author, channel = pick()
+        return (guild, author, channel), {"text": "{user}'s [adj] {noun} will [verb] with {user}"}
+
+    def remind():
+        guild, author, channel = pick()
+        return (guild, author, channel), {"time": random.choice(["in 5 minutes", "tomorrow at 3pm", "in 2 hours"]),
+                                          "message": "load test"}
+
+    def someone():
+        guild, author, channel = pick()
+        target = random.choice([None, None, random.choice(guild.text_channels), random.choice(guild.voice_channels)])
+        role = random.choice([None, random.choice(guild.roles)])
+        return (guild, author, channel), {"channel": target, "role": role, "ping": False, "text": ""}
+
+    def rand():
+        guild, author, channel = pick()
+        return (guild, author, channel), {"choices": "pizza, tacos; sushi. ramen, curry", "mode": "pick"}
+
+    def cleanurl():
+        guild, author, channel = pick()
+        content = " and ".join(random.sample(SAMPLE_URLS, k=2))
+        return (guild, author, channel), {"message": FakeMessage(channel, author, content)}
+
+    return {"roll": roll, "madlib": madlib, "remind": remind, "someone": someone, "random": rand,
+            "Remove URL trackers": cleanurl}
+
+class LagProbe:
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.max_lag = 0.0
+        self.total_lag = 0.0
+        self.sleep_started = 0.0
+        self.task = None
+
+    def _record(self):
+        lag = max(0.0, time.perf_counter() - self.sleep_started - self.interval)
+        self.max_lag = max(self.max_lag, lag)
+        self.total_lag += lag
+
+    async def _run(self):
+        while True:
+            self.sleep_started = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self._record()
+
+    async def start(self):
+        self.task = asyncio.create_task(self._run())
+        await asyncio.sleep(0)
+
+    async def stop(self):
+        self._record()
+        self.task.cancel()
+        try:
+            await self.task
+        except asyncio.CancelledError:
+            pass
+
+def percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+async def run_scenario(bot: HarnessBot, command, make_call, *, requests: int, concurrency: int, warmup: int) -> dict:
+    http = bot.recorder
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    errors = Counter()
+
+    async def invoke(record: bool):
+        async with semaphore:
+            (guild, author, channel), kwargs = make_call()
+            ctx = FakeApplicationContext(http, command, guild, channel, author)
+            started = time.perf_counter()
+            try:
+                await command(ctx, **kwargs)
+            except Exception as e:
+                errors[type(e).__name__] += 1
+            if record:
+                latencies.append(time.perf_counter() - started)
+
+    for _ in range(warmup):
+        await invoke(record=False)
+    http.reset()
+    probe = LagProbe()
+    await probe.start()
+    started = time.perf_counter()
+    await asyncio.gather(*(invoke(record=True) for _ in range(requests)))
+    elapsed = time.perf_counter() - started
+    await probe.stop()
+    return {"command": command.name, "requests": requests, "concurrency": concurrency,
+            "throughput": requests / elapsed if elapsed else 0.0,
+            "p50_ms": percentile(latencies, 50) * 1000, "p95_ms": percentile(latencies, 95) * 1000,
+            "p99_ms": percentile(latencies, 99) * 1000, "max_ms": max(latencies, default=0.0) * 1000,
+            "loop_blocked_pct": min(100.0, probe.total_lag / elapsed * 100) if elapsed else 0.0,
+            "max_loop_lag_ms": probe.max_lag * 1000, "http_calls": sum(http.calls.values()),
+            "errors": dict(errors)}
+
+async def main(args):
+    random.seed(args.seed)
+    with tempfile.TemporaryDirectory(prefix="noyabot-loadtest-") as data_dir:
+        ReminderManager.DB_PATH = os.path.join(data_dir, "reminders.db")
+        MadlibManager.DB_PATH = os.path.join(data_dir, "madlibs.db")
+        AllowlistManager.DB_PATH = os.path.join(data_dir, "allowlist.db")
+        # The URL cleaner reads a copy of the real rules, so nothing under data/ is written
+        if os.path.exists(rule_updater.RULES_PATH):
+            shutil.copy(rule_updater.RULES_PATH, data_dir)
+        rule_updater.RULES_PATH = os.path.join(data_dir, "rules.json")
+
+        http = RecordingHTTP(latency=args.http_latency / 1000)
+        guilds = [FakeGuild(http, args.guild_size) for _ in range(args.guilds)]
+        bot = HarnessBot(http, guilds)
+        bot.add_channel(URL_LOG_CHANNEL_ID, "url-log")
+        bot.add_channel(ERROR_LOG_CHANNEL_ID, "error-log")
+        bot.load_extensions("commands", recursive=True)
+        available = {command.name: command for command in bot.pending_application_commands}
+
+        calls = scenarios(guilds)
+        selected = args.commands or list(calls)
+        results = []
+        print(f"{len(guilds)} guild(s) x {args.guild_size} members, {args.requests} requests per command, "
+              f"concurrency {args.concurrency}, {args.http_latency:g} ms simulated HTTP latency")
+        print(f"{'command':<22}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}"
+              f"{'blocked %':>11}{'max lag ms':>12}  errors")
+        for name in selected:
+            if name not in calls or name not in available:
+                print(f"{name:<22}skipped (unknown command)")
+                continue
+            with contextlib.redirect_stdout(io.StringIO()) if not args.verbose else contextlib.nullcontext():
+                result = await run_scenario(bot, available[name], calls[name], requests=args.requests,
+                                            concurrency=args.concurrency, warmup=args.warmup)
+            results.append(result)
+            print(f"{name:<22}{result['throughput']:>10.1f}{result['p50_ms']:>10.2f}{result['p95_ms']:>10.2f}"
+                  f"{result['p99_ms']:>10.2f}{result['max_ms']:>10.2f}{result['loop_blocked_pct']:>11.1f}"
+                  f"{result['max_loop_lag_ms']:>12.2f}  {result['errors'] or ''}")
+        for cog_name in list(bot.cogs):
+            bot.remove_cog(cog_name)
+        bot.executor.shutdown()
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"timestamp": int(time.time()), "guilds": args.guilds, "guild_size": args.guild_size,
+                       "results": results}, f, indent=2)
+        print(f"Saved results to {args.json}")
+
+def parse_args():
+    parser = argparse.ArgumentParser(prog="python -m loadtest",
+                                     description="Drive the real cogs against an offline gateway stand-in.")
+    parser.add_argument("commands", nargs="*", help="Commands to run (default: all)")
+    parser.add_argument("--requests", type=int, default=500, help="Measured requests per command")
+    parser.add_argument("--concurrency", type=int, default=50, help="Requests in flight at once")
+    parser.add_argument("--guilds", type=int, default=3, help="Number of fake guilds")
+    parser.add_argument("--guild-size", type=int, default=5000, help="Members per fake guild")
+    parser.add_argument("--http-latency", type=float, default=0.0, help="Simulated Discord API latency in ms")
+    parser.add_argument("--warmup", type=int, default=1, help="Unmeasured requests before each command")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for guild and request generation")
+    parser.add_argument("--json", help="Write results to this JSON file")
+    parser.add_argument("--verbose", action="store_true", help="Keep the cogs' own console output")
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
@@ -0,0 +1,224 @@
+import asyncio
+import itertools
+import random
+from collections import Counter
+
+import discord
+
+from utils.executor import OffloadExecutor
+from utils.member_cache import MemberCacheManager
+
+_ids = itertools.count(10**17)
+
+
+def next_id() -> int:
+    return next(_ids)
+
+
+class RecordingHTTP:
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.calls = Counter()
+        self.payloads = []
+
+    async def request(self, route: str, **payload):
+        self.calls[route] += 1
+        self.payloads.append((route, payload))
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+    def reset(self):
+        self.calls.clear()
+        self.payloads.clear()
+
+
+class FakeRole:
+    def __init__(self, guild, name: str, role_id: int | None = None):
+        self.id = role_id or next_id()
+        self.guild = guild
+        self.name = name
+        self.mention = f"<@&{self.id}>"
+
+
+class FakeVoiceState:
+    def __init__(self, channel):
+        self.channel = channel
+
+
+class FakeAsset:
+    def __init__(self, url: str):
+        self.url = url
+
+
+class FakeUser:
+    def __init__(self, http: RecordingHTTP, name: str, *, bot: bool = False):
+        self.http = http
+        self.id = next_id()
+        self.name = name
+        self.display_name = name
+        self.bot = bot
+        self.mention = f"<@{self.id}>"
+        self.display_avatar = FakeAsset(f"https://cdn.discordapp.com/embed/avatars/{self.id % 5}.png")
+
+    async def send(self, content=None, **kwargs):
+        await self.http.request("POST /users/@me/channels/messages", content=content, **kwargs)
+
+
+class FakeMember(FakeUser):
+    def __init__(self, http: RecordingHTTP, guild, name: str, roles: list, *, bot: bool = False):
+        super().__init__(http, name, bot=bot)
+        self.guild = guild
+        self.roles = [guild.default_role, *roles]
+        self.voice = None
+
+
+class FakeTextChannel(discord.TextChannel):
+    def __init__(self, http: RecordingHTTP, guild, name: str, visible_role_ids: set[int] | None = None):
+        self.http = http
+        self.id = next_id()
+        self.guild = guild
+        self.name = name
+        self.visible_role_ids = visible_role_ids
+
+    @property
+    def overwrites(self):
+        return {}
+
+    def permissions_for(self, member, /) -> discord.Permissions:
+        if member.id == self.guild.owner_id or self.visible_role_ids is None:
+            return discord.Permissions(view_channel=True)
+        return discord.Permissions(view_channel=any(role.id in self.visible_role_ids for role in member.roles))
+
+    async def send(self, content=None, **kwargs):
+        await self.http.request(f"POST /channels/{self.id}/messages", content=content, **kwargs)
+
+
+class FakeVoiceChannel(discord.VoiceChannel):
+    def __init__(self, http: RecordingHTTP, guild, name: str):
+        self.http = http
+        self.id = next_id()
+        self.guild = guild
+        self.name = name
+
+    @property
+    def overwrites(self):
+        return {}
+
+    async def send(self, content=None, **kwargs):
+        await self.http.request(f"POST /channels/{self.id}/messages", content=content, **kwargs)
+
+
+class FakeGuild:
+    def __init__(self, http: RecordingHTTP, size: int, *, roles: int = 20, text_channels: int = 5,
+                 voice_channels: int = 3, bot_ratio: float = 0.02, voice_ratio: float = 0.05):
+        self.id = next_id()
+        self.name = f"Load Test Guild {self.id}"
+        self.default_role = FakeRole(self, "@everyone", role_id=self.id)
+        self.roles = [FakeRole(self, f"role-{i}") for i in range(roles)]
+        self.text_channels = [FakeTextChannel(http, self, "general")]
+        for i in range(1, text_channels):
+            visible = {role.id for role in random.sample(self.roles, k=max(1, roles // 4))}
+            self.text_channels.append(FakeTextChannel(http, self, f"text-{i}", visible))
+        self.voice_channels = [FakeVoiceChannel(http, self, f"voice-{i}") for i in range(voice_channels)]
+        self._members = {}
+        for i in range(size):
+            member_roles = random.sample(self.roles, k=random.randint(0, min(4, roles)))
+            member = FakeMember(http, self, f"user{i}", member_roles, bot=random.random() < bot_ratio)
+            if self.voice_channels and random.random() < voice_ratio:
+                member.voice = FakeVoiceState(random.choice(self.voice_channels))
+            self._members[member.id] = member
+        self.me = FakeMember(http, self, "Noyabot", [], bot=True)
+        self._members[self.me.id] = self.me
+        self.owner_id = next(iter(self._members))
+        self.member_count = len(self._members)
+        self.chunked = True
+
+    @property
+    def members(self) -> list:
+        return list(self._members.values())
+
+    def get_member(self, member_id: int):
+        return self._members.get(member_id)
+
+    def _remove_member(self, member):
+        self._members.pop(member.id, None)
+
+
+class FakeMessage:
+    def __init__(self, channel, author, content: str):
+        self.id = next_id()
+        self.channel = channel
+        self.author = author
+        self.content = content
+
+
+class FakeInteraction:
+    def __init__(self):
+        self.id = next_id()
+
+
+class FakeResponse:
+    def __init__(self):
+        self.done = False
+
+    def is_done(self) -> bool:
+        return self.done
+
+
+class FakeFollowup:
+    def __init__(self, ctx):
+        self.ctx = ctx
+
+    async def send(self, content=None, **kwargs):
+        await self.ctx.http.request("POST /webhooks/{application_id}/{token}", content=content, **kwargs)
+
+
+class FakeApplicationContext:
+    def __init__(self, http: RecordingHTTP, command, guild: FakeGuild | None, channel, author):
+        self.http = http
+        self.command = command
+        self.guild = guild
+        self.channel = channel
+        self.author = author
+        self.user = author
+        self.interaction = FakeInteraction()
+        self.response = FakeResponse()
+        self.followup = FakeFollowup(self)
+
+    async def defer(self, ephemeral: bool = False, **kwargs):
+        self.response.done = True
+        await self.http.request("POST /interactions/{id}/{token}/callback", type="defer", ephemeral=ephemeral)
+
+    async def respond(self, content=None, **kwargs):
+        if self.response.done:
+            return await self.followup.send(content, **kwargs)
+        self.response.done = True
+        await self.http.request("POST /interactions/{id}/{token}/callback", content=content, **kwargs)
+
+
+class HarnessBot(discord.Bot):
+    def __init__(self, http: RecordingHTTP, guilds: list[FakeGuild], **kwargs):
+        intents = discord.Intents.default()
+        intents.members = True
+        super().__init__(intents=intents, **kwargs)
+        self.recorder = http
+        self.fake_guilds = guilds
+        self.fake_channels = {}
+        self.member_cache = MemberCacheManager(self)
+        self.executor = OffloadExecutor()
+        self.handoff = {}
+
+    def add_channel(self, channel_id: int, name: str) -> FakeTextChannel:
+        channel = FakeTextChannel(self.recorder, self.fake_guilds[0], name)
+        self.fake_channels[channel_id] = channel
+        return channel
+
+    @property
+    def guilds(self) -> list:
+        return self.fake_guilds
+
+    def get_channel(self, channel_id: int, /):
+        return self.fake_channels.get(channel_id)
+
+    async def is_owner(self, user) -> bool:
+        return True
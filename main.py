@@ -1,19 +1,28 @@
 import asyncio
 import os
+import time
 
 import discord
 from dotenv import load_dotenv
 
-from utils.madlib_manager import MadlibManager
-from utils.remind_manager import ReminderManager
-from utils.url_manager import AllowlistManager
+from utils.executor import OffloadExecutor
+from utils.member_cache import MemberCacheManager
 from utils.rule_updater import update_rules_from_source
+from utils.startup import PROCESS_STARTED, phase, record_phase
 
 load_dotenv()
 intents = discord.Intents.default()
 intents.members = True
 mentions = discord.AllowedMentions(everyone=False, users=True, roles=True, replied_user=True,)
-bot = discord.Bot(intents=intents, allowed_mentions=mentions)
+member_cache_mode = os.getenv("MEMBER_CACHE_MODE", "full")
+bot = discord.Bot(intents=intents, allowed_mentions=mentions, chunk_guilds_at_startup=member_cache_mode != "lazy")
+bot.member_cache = MemberCacheManager(bot, mode=member_cache_mode, ttl=int(os.getenv("MEMBER_CACHE_TTL", 3600)),
+                                      budget_mb=float(os.getenv("MEMBER_CACHE_BUDGET_MB", 0)))
+bot.executor = OffloadExecutor(threads=int(os.getenv("OFFLOAD_THREADS", 4)),
+                               processes=int(os.getenv("OFFLOAD_PROCESSES", 0)),
+                               timeout=float(os.getenv("OFFLOAD_TIMEOUT", 10)))
+bot.handoff = {}
+ready_reported = False
 
 def get_token():
     environment = os.getenv('ENVIRONMENT')
@@ -27,32 +36,40 @@ def get_token():
         raise ValueError("Token not found! Check your .env file and environment setting.")
     return token
 
-async def setup():
-    try:
-        print("Starting databases...")
-        AllowlistManager()
-        ReminderManager()
-        MadlibManager()
-    except Exception as e:
-        print(f"An error occurred during database initialization: {e}")
+async def refresh_rules():
     try:
-        await update_rules_from_source()
+        with phase("rule refresh"):
+            counts = await update_rules_from_source()
+        if counts:
+            bot.dispatch("rules_updated")
     except Exception as e:
         print(f"An error occurred during rule update: {e}")
+
+async def setup():
     try:
-        bot.load_extensions('commands', recursive=True)
         print("Loading commands...")
+        with phase("extensions"):
+            bot.load_extensions('commands', recursive=True)
     except Exception as e:
         print(f"Failed to load extensions: {e}")
+    rule_refresh = asyncio.create_task(refresh_rules())
     try:
+        bot.member_cache.start()
         await bot.start(get_token())
     finally:
+        rule_refresh.cancel()
         if not bot.is_closed():
             print("Shutting down bot...")
+            bot.member_cache.stop()
             await bot.close()
+        bot.executor.shutdown()
 
 @bot.event
 async def on_ready():
+    global ready_reported
+    if not ready_reported:
+        ready_reported = True
+        record_phase("ready", time.perf_counter() - PROCESS_STARTED)
     print(f'{bot.user} is now online and ready!')
     print('-----------------------------------------')
 
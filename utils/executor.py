@@ -0,0 +1,69 @@
+import asyncio
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from utils.metrics import REGISTRY
+
+QUEUE_DEPTH = REGISTRY.gauge("noyabot_executor_queue_depth", "Offloaded tasks submitted but not yet finished.")
+WAIT_TIME = REGISTRY.histogram("noyabot_executor_wait_seconds", "Time an offloaded task waited for a free slot.")
+RUN_TIME = REGISTRY.histogram("noyabot_executor_run_seconds", "Time an offloaded task spent running.")
+TIMEOUTS = REGISTRY.counter("noyabot_executor_timeouts_total", "Offloaded tasks abandoned after their timeout.")
+
+def _timed_call(func, args, kwargs):
+    started = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - started
+
+class OffloadExecutor:
+    def __init__(self, threads: int = 4, processes: int = 0, timeout: float = 10.0):
+        self.threads = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="offload")
+        self.processes = ProcessPoolExecutor(max_workers=processes) if processes else None
+        # One slot per worker, held until the worker is really free, so abandoned work still counts
+        self.slots = {"thread": asyncio.Semaphore(threads), "process": asyncio.Semaphore(max(processes, 1))}
+        self.timeout = timeout
+        self.pending = {"thread": 0, "process": 0}
+
+    def _release(self, kind: str):
+        self.slots[kind].release()
+        self.pending[kind] -= 1
+        QUEUE_DEPTH.set(self.pending[kind], pool=kind)
+
+    def _release_soon(self, loop: asyncio.AbstractEventLoop, kind: str):
+        if not loop.is_closed():
+            loop.call_soon_threadsafe(self._release, kind)
+
+    async def run(self, func, *args, timeout: float | None = None, process: bool = False, **kwargs):
+        kind = "process" if process and self.processes else "thread"
+        pool = self.processes if kind == "process" else self.threads
+        name = getattr(func, "__qualname__", type(func).__name__)
+        loop = asyncio.get_running_loop()
+        self.pending[kind] += 1
+        QUEUE_DEPTH.set(self.pending[kind], pool=kind)
+        queued = time.perf_counter()
+        try:
+            await self.slots[kind].acquire()
+        except BaseException:
+            self.pending[kind] -= 1
+            QUEUE_DEPTH.set(self.pending[kind], pool=kind)
+            raise
+        WAIT_TIME.observe(time.perf_counter() - queued, pool=kind)
+        try:
+            job = pool.submit(_timed_call, func, args, kwargs)
+        except BaseException:
+            self._release(kind)
+            raise
+        job.add_done_callback(lambda _: self._release_soon(loop, kind))
+        try:
+            # A slot guarantees an idle worker, so the timeout only covers running time
+            result, elapsed = await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(job)),
+                                                     timeout or self.timeout)
+        except TimeoutError:
+            TIMEOUTS.inc(pool=kind, task=name)
+            raise
+        RUN_TIME.observe(elapsed, pool=kind, task=name)
+        return result
+
+    def shutdown(self):
+        self.threads.shutdown(wait=False, cancel_futures=True)
+        if self.processes:
+            self.processes.shutdown(wait=False, cancel_futures=True)
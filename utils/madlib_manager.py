@@ -2,15 +2,20 @@ import os
 import random
 import sqlite3
 
+from utils.metrics import SQLITE_QUERY, timed
+
 class MadlibManager:
     DB_PATH = "data/madlibs.db"
 
     def __init__(self):
-        os.makedirs("data", exist_ok=True)
+        os.makedirs(os.path.dirname(self.DB_PATH), exist_ok=True)
         self.conn = sqlite3.connect(self.DB_PATH)
         self.conn.row_factory = sqlite3.Row
         self.cursor = self.conn.cursor()
         self._setup_database()
+        self.reload_static_words()
+
+    def reload_static_words(self):
         self.global_words = {
             "adjective": self._load_static_words("static/adj.txt"),
             "noun": self._load_static_words("static/noun.txt"),
@@ -30,18 +35,21 @@ class MadlibManager:
         with open(path, encoding="utf-8") as f:
             return [line.rstrip("\n") for line in f]
 
+    @timed(SQLITE_QUERY, manager="madlibs")
     def add_word(self, word_type: str, word: str, guild_id: int):
         self.cursor.execute("INSERT INTO words (guild_id, type, value) VALUES (?, ?, ?)",
                             (guild_id, word_type, word))
         self.conn.commit()
         return True
 
+    @timed(SQLITE_QUERY, manager="madlibs")
     def remove_word(self, word_type: str, word: str, guild_id: int):
         self.cursor.execute("DELETE FROM words WHERE guild_id = ? AND type = ? AND value = ?",
                             (guild_id, word_type, word))
         self.conn.commit()
         return self.cursor.rowcount > 0
 
+    @timed(SQLITE_QUERY, manager="madlibs")
     def _get_random_guild_word(self, word_type: str, guild_id: int):
         self.cursor.execute("""SELECT value FROM words WHERE guild_id = ? AND type = ? ORDER BY RANDOM() LIMIT 1""",
                             (guild_id, word_type))
@@ -0,0 +1,94 @@
+import asyncio
+import time
+
+import discord
+from discord.ext import tasks
+
+from utils.metrics import MEMBER_CACHE_BYTES
+
+MEMBER_SIZE_ESTIMATE = 1024  # rough bytes per cached Member plus its User
+
+
+class MemberCacheManager:
+    def __init__(self, bot: discord.Bot, mode: str = "full", ttl: int = 3600, budget_mb: float | None = None):
+        self.bot = bot
+        self.lazy = mode == "lazy"
+        self.ttl = ttl
+        self.budget = int(budget_mb * 1024 * 1024) if budget_mb else None
+        self.loaded: dict[int, float] = {}
+        self.locks: dict[int, asyncio.Lock] = {}
+
+    def start(self):
+        if not self.maintain.is_running():
+            self.maintain.start()
+
+    def stop(self):
+        self.maintain.cancel()
+
+    def is_ready(self, guild: discord.Guild) -> bool:
+        return not self.lazy or guild.id in self.loaded
+
+    async def ensure(self, guild: discord.Guild):
+        if not self.lazy:
+            return
+        if guild.id in self.loaded:
+            self.loaded[guild.id] = time.monotonic()
+            return
+        lock = self.locks.setdefault(guild.id, asyncio.Lock())
+        async with lock:
+            if guild.id not in self.loaded:
+                started = time.perf_counter()
+                await guild.chunk()
+                print(f"Chunked {guild.member_count} members for guild {guild.id} "
+                      f"in {time.perf_counter() - started:.2f}s")
+            self.loaded[guild.id] = time.monotonic()
+
+    def evict(self, guild: discord.Guild) -> int:
+        self.loaded.pop(guild.id, None)
+        self.locks.pop(guild.id, None)
+        keep = guild.me.id if guild.me else None
+        evicted = [member for member_id, member in guild._members.items() if member_id != keep]
+        for member in evicted:
+            guild._remove_member(member)
+        self.bot.dispatch("member_cache_evict", guild)
+        return len(evicted)
+
+    def cached_members(self) -> int:
+        return sum(len(guild._members) for guild in self.bot.guilds)
+
+    def _eviction_order(self) -> list[discord.Guild]:
+        # Guilds only holding members seen in gateway events go first, then chunked guilds from least recently
+        # used, never the most recently used one or a guild that is chunking right now
+        unloaded = [guild for guild in self.bot.guilds if guild.id not in self.loaded and len(guild._members) > 1]
+        unloaded.sort(key=lambda guild: len(guild._members), reverse=True)
+        loaded = [self.bot.get_guild(guild_id) for guild_id in sorted(self.loaded, key=self.loaded.get)[:-1]]
+        return [guild for guild in unloaded + loaded
+                if guild is not None and not (guild.id in self.locks and self.locks[guild.id].locked())]
+
+    @tasks.loop(minutes=5)
+    async def maintain(self):
+        if self.lazy:
+            now = time.monotonic()
+            for guild_id, last_used in list(self.loaded.items()):
+                guild = self.bot.get_guild(guild_id)
+                if guild is None:
+                    self.loaded.pop(guild_id, None)
+                elif now - last_used > self.ttl:
+                    self.evict(guild)
+            if self.budget:
+                cached = self.cached_members()
+                for guild in self._eviction_order():
+                    if cached * MEMBER_SIZE_ESTIMATE <= self.budget:
+                        break
+                    cached -= self.evict(guild)
+        cached = self.cached_members()
+        estimated = cached * MEMBER_SIZE_ESTIMATE
+        MEMBER_CACHE_BYTES.set(estimated)
+        budget = f"{self.budget / 1048576:.0f} MB" if self.budget else "none"
+        print(f"Member cache: {cached} members across {len(self.bot.guilds)} guilds "
+              f"({len(self.loaded) if self.lazy else len(self.bot.guilds)} loaded), "
+              f"~{estimated / 1048576:.1f} MB of {budget} budget")
+
+    @maintain.before_loop
+    async def before_maintain(self):
+        await self.bot.wait_until_ready()
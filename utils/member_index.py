@@ -0,0 +1,139 @@
+import discord
+
+
+class GuildIndex:
+    def __init__(self):
+        self.humans: set[int] = set()
+        self.roles: dict[int, set[int]] = {}
+        self.rolesets: dict[frozenset, set[int]] = {}
+        self.member_rolesets: dict[int, frozenset] = {}
+        self.voice: dict[int, set[int]] = {}
+        self.member_voice: dict[int, int] = {}
+        self.views: dict[int, dict[frozenset, bool]] = {}
+
+
+class MemberIndex:
+    def __init__(self):
+        self.guilds: dict[int, GuildIndex] = {}
+
+    def is_indexed(self, guild_id: int) -> bool:
+        return guild_id in self.guilds
+
+    def build(self, guild: discord.Guild) -> GuildIndex:
+        index = GuildIndex()
+        for member in guild.members:
+            if not member.bot:
+                self._add(index, member)
+        # Chunk responses don't fire member events, so only a fully chunked guild can be kept up to date
+        if guild.chunked:
+            self.guilds[guild.id] = index
+        return index
+
+    def drop(self, guild_id: int):
+        self.guilds.pop(guild_id, None)
+
+    def get(self, guild: discord.Guild) -> GuildIndex:
+        index = self.guilds.get(guild.id)
+        return index if index is not None else self.build(guild)
+
+    @staticmethod
+    def _add(index: GuildIndex, member: discord.Member):
+        roleset = frozenset(role.id for role in member.roles)
+        index.humans.add(member.id)
+        index.member_rolesets[member.id] = roleset
+        index.rolesets.setdefault(roleset, set()).add(member.id)
+        for role_id in roleset:
+            index.roles.setdefault(role_id, set()).add(member.id)
+        if member.voice and member.voice.channel:
+            index.member_voice[member.id] = member.voice.channel.id
+            index.voice.setdefault(member.voice.channel.id, set()).add(member.id)
+
+    @staticmethod
+    def _discard(mapping: dict, key, member_id: int):
+        members = mapping.get(key)
+        if members is None:
+            return
+        members.discard(member_id)
+        if not members:
+            del mapping[key]
+
+    def _remove(self, index: GuildIndex, member_id: int):
+        index.humans.discard(member_id)
+        roleset = index.member_rolesets.pop(member_id, frozenset())
+        self._discard(index.rolesets, roleset, member_id)
+        for role_id in roleset:
+            self._discard(index.roles, role_id, member_id)
+        channel_id = index.member_voice.pop(member_id, None)
+        if channel_id is not None:
+            self._discard(index.voice, channel_id, member_id)
+
+    def add_member(self, member: discord.Member):
+        index = self.guilds.get(member.guild.id)
+        if index is None or member.bot:
+            return
+        self._remove(index, member.id)
+        self._add(index, member)
+
+    def remove_member(self, guild_id: int, member_id: int):
+        index = self.guilds.get(guild_id)
+        if index is not None:
+            self._remove(index, member_id)
+
+    def update_voice(self, member: discord.Member, channel: discord.abc.Connectable | None):
+        index = self.guilds.get(member.guild.id)
+        if index is None or member.id not in index.humans:
+            return
+        old_channel_id = index.member_voice.pop(member.id, None)
+        if old_channel_id is not None:
+            self._discard(index.voice, old_channel_id, member.id)
+        if channel is not None:
+            index.member_voice[member.id] = channel.id
+            index.voice.setdefault(channel.id, set()).add(member.id)
+
+    def invalidate_channel(self, guild_id: int, channel_id: int):
+        index = self.guilds.get(guild_id)
+        if index is not None:
+            index.views.pop(channel_id, None)
+
+    def invalidate_views(self, guild_id: int):
+        index = self.guilds.get(guild_id)
+        if index is not None:
+            index.views.clear()
+
+    def viewers(self, channel: discord.abc.GuildChannel) -> set[int]:
+        guild = channel.guild
+        index = self.get(guild)
+        cache = index.views.setdefault(channel.id, {})
+        # Owners and members with their own overwrites can't share a role-set answer
+        special = {target.id for target in channel.overwrites if not isinstance(target, discord.Role)}
+        special.add(guild.owner_id)
+        viewers = set()
+        for roleset, member_ids in index.rolesets.items():
+            regular = member_ids - special
+            if not regular:
+                continue
+            allowed = cache.get(roleset)
+            if allowed is None:
+                member = guild.get_member(next(iter(regular)))
+                if member is None:
+                    continue
+                allowed = cache[roleset] = channel.permissions_for(member).view_channel
+            if allowed:
+                viewers |= regular
+        for member_id in special & index.humans:
+            member = guild.get_member(member_id)
+            if member is not None and channel.permissions_for(member).view_channel:
+                viewers.add(member_id)
+        return viewers
+
+    def pool(self, guild: discord.Guild, *, role: discord.Role | None = None,
+             channel: discord.abc.GuildChannel | None = None) -> set[int]:
+        index = self.get(guild)
+        pool = set(index.humans)
+        if role:
+            pool &= index.roles.get(role.id, set())
+        if isinstance(channel, discord.VoiceChannel):
+            pool &= index.voice.get(channel.id, set())
+        elif isinstance(channel, discord.TextChannel):
+            pool &= self.viewers(channel)
+        return pool
@@ -1,11 +1,13 @@
 import os
 import sqlite3
 
+from utils.metrics import SQLITE_QUERY, timed
+
 class ReminderManager:
     DB_PATH = "data/reminders.db"
 
     def __init__(self):
-        os.makedirs("data", exist_ok=True)
+        os.makedirs(os.path.dirname(self.DB_PATH), exist_ok=True)
         self.conn = sqlite3.connect(self.DB_PATH)
         self.conn.row_factory = sqlite3.Row
         self.cursor = self.conn.cursor()
@@ -18,6 +20,7 @@ class ReminderManager:
                                 TEXT NOT NULL)""")
         self.conn.commit()
 
+    @timed(SQLITE_QUERY, manager="reminders")
     def add_reminder(self, author_id: int, channel_id: int, reminder_timestamp: int, message: str) -> int:
         self.cursor.execute("INSERT INTO reminders (author_id, channel_id, reminder_timestamp, message) "
                             "VALUES (?, ?, ?, ?)",
@@ -25,14 +28,17 @@ class ReminderManager:
         self.conn.commit()
         return self.cursor.lastrowid
 
+    @timed(SQLITE_QUERY, manager="reminders")
     def get_reminder(self, reminder_id: int):
         self.cursor.execute("SELECT * FROM reminders WHERE id = ?", (reminder_id,))
         return self.cursor.fetchone()
 
+    @timed(SQLITE_QUERY, manager="reminders")
     def get_due_reminders(self, current_timestamp: int) -> list:
         self.cursor.execute("SELECT * FROM reminders WHERE reminder_timestamp <= ?", (current_timestamp,))
         return self.cursor.fetchall()
 
+    @timed(SQLITE_QUERY, manager="reminders")
     def remove_reminder(self, reminder_id: int):
         self.cursor.execute("DELETE FROM reminders WHERE id = ?", (reminder_id,))
         self.conn.commit()
@@ -55,7 +55,7 @@ async def update_rules_from_source():
     specific_rule_count = len(final_rules) - 1 if "GENERAL" in final_rules else len(final_rules)
     general_rule_count = len(final_rules.get("GENERAL", []))
     try:
-        os.makedirs("data", exist_ok=True)
+        os.makedirs(os.path.dirname(RULES_PATH), exist_ok=True)
         async with aiofiles.open(RULES_PATH, 'w', encoding='utf-8') as f:
             await f.write(json.dumps(final_rules, indent=2))
         print(f"Successfully saved rules to {RULES_PATH}.")
@@ -0,0 +1,19 @@
+import time
+from contextlib import contextmanager
+
+from utils.metrics import REGISTRY
+
+STARTUP_PHASE = REGISTRY.gauge("noyabot_startup_phase_seconds", "Duration of each startup phase.")
+PROCESS_STARTED = time.perf_counter()
+
+def record_phase(name: str, seconds: float):
+    STARTUP_PHASE.set(seconds, phase=name)
+    print(f"Startup phase '{name}' took {seconds:.2f}s")
+
+@contextmanager
+def phase(name: str):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_phase(name, time.perf_counter() - started)
\ No newline at end of file
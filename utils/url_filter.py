@@ -0,0 +1,52 @@
+import math
+from collections import Counter
+from urllib.parse import urlparse, urlunparse, parse_qs, urlencode
+
+# Plain functions of their arguments, so the executor can send them to a worker process
+
+def calculate_entropy(text: str) -> float:
+    if not text:
+        return 0.0
+    entropy = 0
+    length = len(text)
+    counts = Counter(text)
+    for count in counts.values():
+        p_x = count / length
+        entropy += - p_x * math.log2(p_x)
+    return entropy
+
+def domain_suffixes(netloc: str) -> list[str]:
+    domain_parts = netloc.lower().split('.')
+    return [".".join(domain_parts[i:]) for i in range(len(domain_parts))]
+
+def rules_for(urls: list[str], rules: dict) -> dict:
+    relevant = {"GENERAL": rules.get("GENERAL", [])}
+    for url in urls:
+        for domain in domain_suffixes(urlparse(url).netloc):
+            if domain in rules:
+                relevant[domain] = rules[domain]
+    return relevant
+
+def filter_fallback(url: str, rules: dict) -> str:
+    parsed_url = urlparse(url)
+    query_params = parse_qs(parsed_url.query)
+    params_to_remove = {p.lower() for p in rules.get("GENERAL", [])}
+    for current_domain in domain_suffixes(parsed_url.netloc):
+        if current_domain in rules:
+            params_to_remove.update({p.lower() for p in rules[current_domain]})
+    filtered_params = {key: value for key, value in query_params.items() if key.lower() not in params_to_remove}
+    final_params = {}
+    for key, value_list in filtered_params.items():
+        value_str = value_list[0]
+        if len(value_str) >= 20:
+            entropy = calculate_entropy(value_str)
+            if entropy >= 4:
+                continue
+        final_params[key] = value_list
+    new_query = urlencode(final_params, doseq=True)
+    url_parts = list(parsed_url)
+    url_parts[4] = new_query
+    return urlunparse(url_parts)
+
+def filter_fallback_all(urls: list[str], rules: dict) -> dict[str, str]:
+    return {url: filter_fallback(url, rules) for url in urls}
@@ -1,64 +1,115 @@
 import os
 import sqlite3
+from collections import OrderedDict
+
+from utils.metrics import ALLOWLIST_CACHE, SQLITE_QUERY, timed
 
 class AllowlistManager:
     DB_PATH = "data/allowlist.db"
+    CACHE_SIZE = 4096
 
     def __init__(self):
-        os.makedirs("data", exist_ok=True)
+        os.makedirs(os.path.dirname(self.DB_PATH), exist_ok=True)
         self.conn = sqlite3.connect(self.DB_PATH)
         self.conn.row_factory = sqlite3.Row
         self.cursor = self.conn.cursor()
+        self.cache: OrderedDict[str, list[str] | None] = OrderedDict()
         self._setup_database()
 
     def _setup_database(self):
-        self.cursor.execute("""CREATE TABLE IF NOT EXISTS allowlist 
-                               (domain TEXT PRIMARY KEY NOT NULL, params TEXT NOT NULL)""")
+        self.cursor.execute("""CREATE TABLE IF NOT EXISTS allowlist_params
+                               (domain TEXT NOT NULL, param TEXT NOT NULL, PRIMARY KEY (domain, param))
+                               WITHOUT ROWID""")
+        legacy = self.cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'allowlist'")
+        if legacy.fetchone():
+            rows = self.cursor.execute("SELECT domain, params FROM allowlist").fetchall()
+            pairs = {(row['domain'], param) for row in rows for param in row['params'].split(',') if param}
+            self.cursor.executemany("INSERT OR IGNORE INTO allowlist_params (domain, param) VALUES (?, ?)", pairs)
+            migrated = {(row['domain'], row['param'])
+                        for row in self.cursor.execute("SELECT domain, param FROM allowlist_params").fetchall()}
+            if not pairs <= migrated:
+                self.conn.rollback()
+                raise RuntimeError(f"Allowlist migration copied {len(pairs & migrated)} of {len(pairs)} parameters, "
+                                   "keeping the legacy table.")
+            self.cursor.execute("DROP TABLE allowlist")
+            print(f"Migrated {len(rows)} allowlisted domains to the normalized schema.")
         self.conn.commit()
 
     def close(self):
         self.conn.close()
 
     def get_params(self, domain: str) -> list[str] | None:
+        if domain in self.cache:
+            ALLOWLIST_CACHE.inc(result="hit")
+            self.cache.move_to_end(domain)
+            return self.cache[domain]
+        ALLOWLIST_CACHE.inc(result="miss")
+        params = self._lookup_params(domain)
+        self.cache[domain] = params
+        if len(self.cache) > self.CACHE_SIZE:
+            self.cache.popitem(last=False)
+        return params
+
+    @timed(SQLITE_QUERY, manager="allowlist")
+    def _lookup_params(self, domain: str) -> list[str] | None:
         domain_parts = domain.split('.')
-        for i in range(len(domain_parts)):
-            current_domain = ".".join(domain_parts[i:])
-            self.cursor.execute("SELECT params FROM allowlist WHERE domain = ?", (current_domain,))
-            result = self.cursor.fetchone()
-            if result:
-                return result['params'].split(',')
+        candidates = [".".join(domain_parts[i:]) for i in range(len(domain_parts))]
+        placeholders = ",".join("?" * len(candidates))
+        self.cursor.execute(f"SELECT domain, param FROM allowlist_params WHERE domain IN ({placeholders})",
+                            candidates)
+        matches = {}
+        for row in self.cursor.fetchall():
+            matches.setdefault(row['domain'], []).append(row['param'])
+        for current_domain in candidates:
+            if current_domain in matches:
+                return matches[current_domain]
         return None
 
+    def _domain_params(self, domain: str) -> set[str]:
+        self.cursor.execute("SELECT param FROM allowlist_params WHERE domain = ?", (domain,))
+        return {row['param'] for row in self.cursor.fetchall()}
+
+    @timed(SQLITE_QUERY, manager="allowlist")
     def append_param(self, domain: str, param: str) -> tuple[bool, set]:
-        self.cursor.execute("SELECT params FROM allowlist WHERE domain = ?", (domain,))
-        result = self.cursor.fetchone()
-        if result:
-            params = set(result['params'].split(','))
-            if param in params:
-                return True, params
-            params.add(param)
-        else:
-            params = {param}
-        new_params_str = ",".join(sorted(list(params)))
-        self.cursor.execute("INSERT OR REPLACE INTO allowlist (domain, params) VALUES (?, ?)", (domain, new_params_str))
+        self.cursor.execute("INSERT OR IGNORE INTO allowlist_params (domain, param) VALUES (?, ?)", (domain, param))
+        was_present = self.cursor.rowcount == 0
         self.conn.commit()
-        return False, params
+        self.cache.clear()
+        return was_present, self._domain_params(domain)
 
+    @timed(SQLITE_QUERY, manager="allowlist")
     def remove_param(self, domain: str, param: str) -> tuple[str, set | None]:
-        self.cursor.execute("SELECT params FROM allowlist WHERE domain = ?", (domain,))
-        result = self.cursor.fetchone()
-        if not result:
+        params = self._domain_params(domain)
+        if not params:
             return "domain_not_found", None
-        params = set(result['params'].split(','))
         if param not in params:
             return "param_not_found", params
-        params.remove(param)
-        if not params:
-            self.cursor.execute("DELETE FROM allowlist WHERE domain = ?", (domain,))
-            status = "domain_removed"
-        else:
-            new_params_str = ",".join(sorted(list(params)))
-            self.cursor.execute("UPDATE allowlist SET params = ? WHERE domain = ?", (new_params_str, domain))
-            status = "param_removed"
+        self.cursor.execute("DELETE FROM allowlist_params WHERE domain = ? AND param = ?", (domain, param))
         self.conn.commit()
-        return status, params
\ No newline at end of file
+        self.cache.clear()
+        params.remove(param)
+        return ("param_removed" if params else "domain_removed"), params
+
+    @timed(SQLITE_QUERY, manager="allowlist")
+    def import_allowlist(self, allowlist: dict[str, list[str]], replace: bool = False) -> tuple[int, int]:
+        rows = {(domain.strip().lower(), param.strip().lower())
+                for domain, params in allowlist.items() for param in params if domain.strip() and param.strip()}
+        if replace and not rows:
+            raise ValueError("it has no domains with parameters, refusing to replace the allowlist with nothing")
+        with self.conn:
+            if replace:
+                self.conn.execute("DELETE FROM allowlist_params")
+            before = self.conn.total_changes
+            self.conn.executemany("INSERT OR IGNORE INTO allowlist_params (domain, param) VALUES (?, ?)",
+                                  sorted(rows))
+            added = self.conn.total_changes - before
+        self.cache.clear()
+        return len({domain for domain, _ in rows}), added
+
+    @timed(SQLITE_QUERY, manager="allowlist")
+    def export_allowlist(self) -> dict[str, list[str]]:
+        allowlist = {}
+        self.cursor.execute("SELECT domain, param FROM allowlist_params ORDER BY domain, param")
+        for row in self.cursor.fetchall():
+            allowlist.setdefault(row['domain'], []).append(row['param'])
+        return allowlist